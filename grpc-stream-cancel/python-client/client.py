@@ -1,13 +1,55 @@
 import asyncio
 import grpc
+import itertools
+import random
 import time
 import sys
 import os
 
+import uvloop
+
 import streaming_pb2
 import streaming_pb2_grpc
 
 
+# 장수명 스트림용 채널 옵션: keepalive로 유휴 연결을 유지하고,
+# BDP probe로 HTTP/2 flow-control 윈도우를 대역폭에 맞게 키운다
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.http2.min_time_between_pings_ms", 10000),
+    ("grpc.http2.bdp_probe", 1),
+]
+
+
+class ChannelPool:
+    """여러 gRPC 채널을 라운드로빈으로 돌려쓰는 풀
+
+    채널 하나는 보통 HTTP/2 연결 하나를 공유하므로 동시 스트림 수와
+    flow-control 윈도우에 묶인다. channel-arg를 다르게 주면 subchannel
+    재사용을 피해 채널마다 독립적인 TCP 연결을 갖게 된다.
+    """
+
+    def __init__(self, server_address, size=4):
+        self._channels = [
+            grpc.aio.insecure_channel(
+                server_address,
+                options=CHANNEL_OPTIONS + [("grpc.channel_id", i)])
+            for i in range(size)
+        ]
+        self._cycle = itertools.cycle(self._channels)
+
+    def next(self):
+        """다음 채널을 라운드로빈으로 반환"""
+        return next(self._cycle)
+
+    async def close(self):
+        for channel in self._channels:
+            await channel.close()
+
+
 class StreamingClient:
     def __init__(self, server_address=None):
         # 환경변수에서 서버 주소 가져오기 (프록시 테스트용)
@@ -28,122 +70,131 @@ class StreamingClient:
         self.start_time = None
 
         
-    async def bidirectional_stream(self):
-        async with grpc.aio.insecure_channel(self.server_address) as channel:
-            stub = streaming_pb2_grpc.StreamingServiceStub(channel)
-            
-            # 순수 gRPC 표준 request generator (데이터 전송 없음)
-            async def empty_request_generator():
-                # 클라이언트에서 서버로 보낼 데이터가 없는 경우
-                # 빈 generator로 테스트
-                yield
-
-            try:
-                print("🔗 [PYTHON CLIENT] Establishing bidirectional stream...")
-                self.call = stub.BidirectionalStream(empty_request_generator())
-                self.start_time = time.time()
-                
-                async for response in self.call:
-                    self.message_count += 1
-                    # 이제 직접 DataMessage를 받음
-                    print(f"📨 [PYTHON CLIENT] Received message {response.id}: {response.payload}")
-                    
-                    # 자동 cancel 체크
-                    if self.auto_cancel_delay is not None:
-                        elapsed = time.time() - self.start_time
-                        if elapsed >= self.auto_cancel_delay:
-                            print(f"⏰ [PYTHON CLIENT] Auto-cancel triggered after {elapsed:.1f}s (delay: {self.auto_cancel_delay}s)")
-                            print("📤 [PYTHON CLIENT] Calling gRPC cancel() → RST_STREAM")
-                            self.call.cancel()
-                            break
-                
-                print(f"✅ [PYTHON CLIENT] Stream ended normally. Total: {self.message_count} messages")
-                            
-            except grpc.aio.AioRpcError as e:
-                print(f"⚠️  [PYTHON CLIENT] gRPC Error occurred:")
-                print(f"   Status Code: {e.code()}")
-                print(f"   Details: {e.details()}")
-                print(f"   Messages received before error: {self.message_count}")
-                
-                if e.code() == grpc.StatusCode.CANCELLED:
-                    print("🚫 [PYTHON CLIENT] Stream was CANCELLED")
-                    print("   → This should correspond to RST_STREAM on server side")
-                elif e.code() == grpc.StatusCode.UNAVAILABLE:
-                    print("🔌 [PYTHON CLIENT] Server UNAVAILABLE - likely network issue")
-                elif e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
-                    print("⏰ [PYTHON CLIENT] DEADLINE_EXCEEDED - timeout occurred")
-                else:
-                    print(f"❓ [PYTHON CLIENT] Other error: {e.code()}")
-                    
-            except asyncio.CancelledError:
-                print("🚫 [PYTHON CLIENT] AsyncIO CancelledError - likely from call.cancel()")
-                print(f"   Messages received before cancellation: {self.message_count}")
-                    
-            except Exception as e:
-                print(f"💥 [PYTHON CLIENT] Unexpected error: {e}")
+    async def bidirectional_stream(self, pool):
+        stub = streaming_pb2_grpc.StreamingServiceStub(pool.next())
+
+        # 순수 gRPC 표준 request generator (데이터 전송 없음)
+        async def empty_request_generator():
+            # 클라이언트에서 서버로 보낼 데이터가 없는 경우
+            # 빈 generator로 테스트
+            yield
+
+        def auto_cancel():
+            print(f"⏰ [PYTHON CLIENT] Auto-cancel triggered after {self.auto_cancel_delay}s")
+            print("📤 [PYTHON CLIENT] Calling gRPC cancel() → RST_STREAM")
+            self.call.cancel()
+
+        cancel_handle = None
+        # 핫 루프의 속성 조회(LOAD_ATTR)를 로컬 바인딩으로 대체
+        msg_count = self.message_count
+        try:
+            print("🔗 [PYTHON CLIENT] Establishing bidirectional stream...")
+            self.call = stub.BidirectionalStream(empty_request_generator())
+            # 경과 시간 측정이므로 NTP 보정에 영향받지 않는 monotonic 시계 사용
+            self.start_time = time.monotonic()
+
+            # 매 메시지마다 시간을 확인하는 대신 이벤트 루프 타이머 한 번으로 처리
+            if self.auto_cancel_delay is not None:
+                cancel_handle = asyncio.get_running_loop().call_later(
+                    self.auto_cancel_delay, auto_cancel)
+
+            async for response in self.call:
+                msg_count += 1
+                # 이제 직접 DataMessage를 받음
+                print(f"📨 [PYTHON CLIENT] Received message {response.id}: {response.payload}")
+
+            print(f"✅ [PYTHON CLIENT] Stream ended normally. Total: {msg_count} messages")
+
+        except grpc.aio.AioRpcError as e:
+            print(f"⚠️  [PYTHON CLIENT] gRPC Error occurred:")
+            print(f"   Status Code: {e.code()}")
+            print(f"   Details: {e.details()}")
+            print(f"   Messages received before error: {msg_count}")
+
+            if e.code() == grpc.StatusCode.CANCELLED:
+                print("🚫 [PYTHON CLIENT] Stream was CANCELLED")
+                print("   → This should correspond to RST_STREAM on server side")
+            elif e.code() == grpc.StatusCode.UNAVAILABLE:
+                print("🔌 [PYTHON CLIENT] Server UNAVAILABLE - likely network issue")
+            elif e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                print("⏰ [PYTHON CLIENT] DEADLINE_EXCEEDED - timeout occurred")
+            else:
+                print(f"❓ [PYTHON CLIENT] Other error: {e.code()}")
+
+        except asyncio.CancelledError:
+            print("🚫 [PYTHON CLIENT] AsyncIO CancelledError - likely from call.cancel()")
+            print(f"   Messages received before cancellation: {msg_count}")
+
+        except Exception as e:
+            print(f"💥 [PYTHON CLIENT] Unexpected error: {e}")
+
+        finally:
+            # 루프 종료 시 한 번만 카운터를 되써 줌
+            self.message_count = msg_count
+            # 스트림이 정상 종료된 뒤 타이머가 뒤늦게 발화하지 않도록 해제
+            if cancel_handle is not None:
+                cancel_handle.cancel()
 
 
     async def run_simple_test(self):
         """간단한 연결 테스트 - 재연결 포함"""
         print("🔗 [PYTHON CLIENT] Starting connection test with auto-reconnection...")
-        
+
         max_retries = 50  # 더 많은 재시도 허용
         retry_count = 0
-        consecutive_failures = 0
-        
-        while retry_count < max_retries:
-            try:
-                print(f"🔗 [PYTHON CLIENT] Connection attempt {retry_count + 1}")
-                await self.bidirectional_stream()
-                
-                # 스트림이 정상 종료되면 완료
-                print("✅ [PYTHON CLIENT] Stream completed by server")
-                consecutive_failures = 0  # 성공 시 연속 실패 카운트 리셋
-                
-                # 서버가 모든 메시지를 보냈는지 확인
-                print(f"📊 [PYTHON CLIENT] Total messages received: {self.message_count}")
-                print("🎉 [PYTHON CLIENT] Server completed sending all messages!")
-                break  # 서버가 스트림을 닫았으므로 재시도 불필요
-                
-            except grpc.aio.AioRpcError as e:
-                retry_count += 1
-                consecutive_failures += 1
-                
-                print(f"🔌 [PYTHON CLIENT] gRPC error (attempt {retry_count}/{max_retries}): {e.code()}")
-                print(f"📊 [PYTHON CLIENT] Messages received so far: {self.message_count}")
-                
-                # 네트워크 오류인 경우 더 자주 재시도
-                if e.code() in [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED]:
-                    retry_delay = 1  # 네트워크 오류는 1초 후 재시도
-                    print(f"🔄 [PYTHON CLIENT] Network error detected, retrying in {retry_delay}s...")
-                else:
-                    retry_delay = 2  # 다른 오류는 2초 후 재시도
-                    print(f"🔄 [PYTHON CLIENT] Other gRPC error, retrying in {retry_delay}s...")
-                
-                if retry_count < max_retries:
-                    await asyncio.sleep(retry_delay)
-                else:
-                    print("❌ [PYTHON CLIENT] Max retries reached")
-                    
-            except Exception as e:
-                retry_count += 1
-                consecutive_failures += 1
-                
-                print(f"💥 [PYTHON CLIENT] Unexpected error (attempt {retry_count}/{max_retries}): {e}")
-                print(f"📊 [PYTHON CLIENT] Messages received so far: {self.message_count}")
-                
-                if retry_count < max_retries:
-                    print("🔄 [PYTHON CLIENT] Retrying in 2 seconds...")
-                    await asyncio.sleep(2)
-                else:
-                    print("❌ [PYTHON CLIENT] Max retries reached")
-            
-            # 연속 실패가 너무 많으면 잠시 대기
-            if consecutive_failures >= 5:
-                print(f"⚠️ [PYTHON CLIENT] {consecutive_failures} consecutive failures, waiting longer...")
-                await asyncio.sleep(5)
-                consecutive_failures = 0
-                    
+        backoff = 0.2  # 지수 백오프 시작값 (초)
+
+        # 재시도마다 새 채널을 만들지 않고 풀 하나를 전체 시도에 걸쳐 재사용
+        # (gRPC 채널은 끊어진 연결을 내부적으로 다시 맺어 줌)
+        pool = ChannelPool(self.server_address)
+
+        async def backoff_sleep():
+            # 지수 백오프 + 지터: 빠르게 수렴하면서 복구 시점의 동시 재접속 폭주 방지
+            nonlocal backoff
+            retry_delay = min(backoff, 10) * (0.5 + random.random())
+            backoff *= 2
+            print(f"🔄 [PYTHON CLIENT] Retrying in {retry_delay:.1f}s...")
+            await asyncio.sleep(retry_delay)
+
+        try:
+            while retry_count < max_retries:
+                try:
+                    print(f"🔗 [PYTHON CLIENT] Connection attempt {retry_count + 1}")
+                    await self.bidirectional_stream(pool)
+
+                    # 스트림이 정상 종료되면 완료
+                    print("✅ [PYTHON CLIENT] Stream completed by server")
+
+                    # 서버가 모든 메시지를 보냈는지 확인
+                    print(f"📊 [PYTHON CLIENT] Total messages received: {self.message_count}")
+                    print("🎉 [PYTHON CLIENT] Server completed sending all messages!")
+                    break  # 서버가 스트림을 닫았으므로 재시도 불필요
+
+                except grpc.aio.AioRpcError as e:
+                    retry_count += 1
+
+                    print(f"🔌 [PYTHON CLIENT] gRPC error (attempt {retry_count}/{max_retries}): {e.code()}")
+                    print(f"📊 [PYTHON CLIENT] Messages received so far: {self.message_count}")
+
+                    if retry_count < max_retries:
+                        await backoff_sleep()
+                    else:
+                        print("❌ [PYTHON CLIENT] Max retries reached")
+
+                except Exception as e:
+                    retry_count += 1
+
+                    print(f"💥 [PYTHON CLIENT] Unexpected error (attempt {retry_count}/{max_retries}): {e}")
+                    print(f"📊 [PYTHON CLIENT] Messages received so far: {self.message_count}")
+
+                    if retry_count < max_retries:
+                        await backoff_sleep()
+                    else:
+                        print("❌ [PYTHON CLIENT] Max retries reached")
+
+        finally:
+            await pool.close()
+
         print(f"📊 [PYTHON CLIENT] Final stats: {self.message_count} messages received total")
         print("🏁 [PYTHON CLIENT] Test completed")
 
@@ -153,7 +204,25 @@ class StreamingClient:
         print("   Expected: Automatic call.cancel() → Server detects intentional cancellation")
         
         self.auto_cancel_delay = delay
-        await self.bidirectional_stream()
+        pool = ChannelPool(self.server_address)
+        try:
+            await self.bidirectional_stream(pool)
+        finally:
+            await pool.close()
+
+    @staticmethod
+    def _run_coroutine(coro):
+        """eager task factory가 설정된 새 이벤트 루프에서 코루틴 실행"""
+        def loop_factory():
+            loop = asyncio.new_event_loop()
+            # 즉시 완료 가능한 코루틴은 스케줄러를 거치지 않고 바로 실행
+            loop.set_task_factory(asyncio.eager_task_factory)
+            return loop
+
+        # Runner는 asyncio.run과 같은 종료 정리(잔여 태스크 취소,
+        # shutdown_asyncgens)를 수행한 뒤 루프를 닫아 줌
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(coro)
 
     def run(self, mode="auto_cancel", cancel_delay=3.0):
         """클라이언트 실행 - 의도적 취소 vs 네트워크 단절 테스트"""
@@ -161,13 +230,16 @@ class StreamingClient:
         print(f"🔗 [PYTHON CLIENT] Connecting to server at {self.server_address}")
         print()
         
+        # libuv 기반 이벤트 루프로 교체 (asyncio API 호환, I/O 오버헤드 감소)
+        uvloop.install()
+
         if mode == "auto_cancel":
-            asyncio.run(self.run_auto_cancel_test(cancel_delay))
-            
+            self._run_coroutine(self.run_auto_cancel_test(cancel_delay))
+
         elif mode == "simple":
             print("🔄 [PYTHON CLIENT] SIMPLE MODE: Basic connection test")
             print("   Expected: Receive all messages from server")
-            asyncio.run(self.run_simple_test())
+            self._run_coroutine(self.run_simple_test())
             
         else:
             print(f"❌ [PYTHON CLIENT] Unknown mode: {mode}. Use 'auto_cancel' or 'simple'")
@@ -1,9 +1,20 @@
+import os
+import sys
+
 import grpc_tools.protoc
 
+PROTO_SRC = '../proto/streaming.proto'
+GENERATED = ['streaming_pb2.py', 'streaming_pb2_grpc.py']
+
+# 생성된 파일이 proto보다 최신이면 protoc 재실행을 건너뜀
+if all(os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(PROTO_SRC)
+       for out in GENERATED):
+    sys.exit(0)
+
 grpc_tools.protoc.main([
     'grpc_tools.protoc',
     '-I../proto',
     '--python_out=.',
     '--grpc_python_out=.',
     '../proto/streaming.proto'
-])
\ No newline at end of file
+])
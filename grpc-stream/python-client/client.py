@@ -1,67 +1,144 @@
 import asyncio
 import grpc
+import itertools
 import time
 import random
 from asyncio import Queue
 
+import uvloop
+
 import streaming_pb2
 import streaming_pb2_grpc
 
 
+# 장수명 스트림용 채널 옵션: keepalive로 유휴 연결을 유지하고,
+# BDP probe로 HTTP/2 flow-control 윈도우를 대역폭에 맞게 키운다
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.http2.min_time_between_pings_ms", 10000),
+    ("grpc.http2.bdp_probe", 1),
+]
+
+
+class ChannelPool:
+    """여러 gRPC 채널을 라운드로빈으로 돌려쓰는 풀
+
+    채널 하나는 보통 HTTP/2 연결 하나를 공유하므로 동시 스트림 수와
+    flow-control 윈도우에 묶인다. channel-arg를 다르게 주면 subchannel
+    재사용을 피해 채널마다 독립적인 TCP 연결을 갖게 된다.
+    """
+
+    def __init__(self, server_address, size=4):
+        self._channels = [
+            grpc.aio.insecure_channel(
+                server_address,
+                options=CHANNEL_OPTIONS + [("grpc.channel_id", i)])
+            for i in range(size)
+        ]
+        self._cycle = itertools.cycle(self._channels)
+
+    def next(self):
+        """다음 채널을 라운드로빈으로 반환"""
+        return next(self._cycle)
+
+    async def close(self):
+        for channel in self._channels:
+            await channel.close()
+
+
 class StreamingClient:
     def __init__(self, server_address='[::1]:50051'):
         self.server_address = server_address
-        self.response_queue = Queue()
-        self.received_messages = set()
+        # 큐를 제한해서 서버가 generator보다 앞서갈 때 put이 블록되며
+        # 자연스러운 backpressure가 걸리도록 함
+        self.response_queue = Queue(maxsize=64)
+        # 수신한 message id를 set 대신 비트맵으로 기록
+        # (id가 조밀한 작은 정수라서 int 객체 + 해시 테이블보다 훨씬 작음)
+        self._seen = bytearray(1 << 16)
         self.should_simulate_drops = True
         self.drop_probability = 0.1
 
+    def has_received(self, message_id):
+        """해당 message id를 수신(ACK)했는지 여부"""
+        byte_index = message_id >> 3
+        return byte_index < len(self._seen) and bool(
+            self._seen[byte_index] & (1 << (message_id & 7)))
+
     async def bidirectional_stream(self):
-        async with grpc.aio.insecure_channel(self.server_address) as channel:
-            stub = streaming_pb2_grpc.StreamingServiceStub(channel)
-            
+        pool = ChannelPool(self.server_address)
+        try:
+            stub = streaming_pb2_grpc.StreamingServiceStub(pool.next())
+
             # 스트림 종료를 위한 플래그
             stream_finished = asyncio.Event()
             
             async def request_generator():
                 while not stream_finished.is_set():
+                    # 큐에 메시지가 오거나 스트림이 종료될 때까지 잠들어 있음 (폴링 없음)
+                    get_task = asyncio.ensure_future(self.response_queue.get())
+                    finished_task = asyncio.ensure_future(stream_finished.wait())
+                    try:
+                        done, _ = await asyncio.wait(
+                            {get_task, finished_task},
+                            return_when=asyncio.FIRST_COMPLETED
+                        )
+                    finally:
+                        # 어떤 경로로 빠져나가든 두 태스크를 취소하고 끝까지
+                        # 회수해서 루프 종료 시점의 GC에 정리를 맡기지 않음
+                        get_task.cancel()
+                        finished_task.cancel()
+                        await asyncio.gather(get_task, finished_task,
+                                             return_exceptions=True)
+                    if get_task not in done:
+                        break
                     try:
-                        ack_msg = await asyncio.wait_for(self.response_queue.get(), timeout=0.5)
-                        yield ack_msg
-                    except asyncio.TimeoutError:
-                        # 타임아웃 시에도 스트림이 종료되지 않았다면 계속 대기
-                        continue
+                        # 큐에는 직렬화된 bytes가 들어 있으므로 전송 직전에 한 번만 파싱
+                        yield streaming_pb2.StreamMessage.FromString(get_task.result())
                     except Exception as e:
                         print(f"[PYTHON CLIENT] Error in request_generator: {e}")
                         break
                 print("[PYTHON CLIENT] Request generator finished")
 
+            # 핫 루프의 속성/전역 조회(LOAD_ATTR/LOAD_GLOBAL)를 로컬 바인딩으로 대체
+            simulate_drops = self.should_simulate_drops
+            drop_probability = self.drop_probability
+            seen = self._seen
+            response_queue = self.response_queue
+            _random = random.random
+            _time = time.time
+
+            # ACK마다 래퍼 객체 두 개를 새로 만들지 않도록 템플릿 하나를 재사용
+            ack_template = streaming_pb2.StreamMessage()
+
             try:
                 call = stub.BidirectionalStream(request_generator())
-                
+
                 async for response in call:
                     if response.HasField('data'):
                         data_msg = response.data
                         message_id = data_msg.id
-                        
+
                         print(f"[PYTHON CLIENT] Received message {message_id}: {data_msg.payload}")
-                        
-                        should_drop = (self.should_simulate_drops and 
-                                     random.random() < self.drop_probability)
-                        
+
+                        should_drop = simulate_drops and _random() < drop_probability
+
                         if should_drop:
                             print(f"[PYTHON CLIENT] Simulating drop for message {message_id}")
                         else:
-                            self.received_messages.add(message_id)
-                            
-                            ack = streaming_pb2.StreamMessage(
-                                ack=streaming_pb2.AckMessage(
-                                    ack_id=message_id,
-                                    timestamp=int(time.time())
-                                )
-                            )
-                            
-                            await self.response_queue.put(ack)
+                            byte_index = message_id >> 3
+                            if byte_index >= len(seen):
+                                # 비트맵을 기하급수적으로 확장 (extend는 in-place)
+                                seen.extend(bytes(max(len(seen), byte_index + 1 - len(seen))))
+                            seen[byte_index] |= 1 << (message_id & 7)
+
+                            ack_template.ack.ack_id = message_id
+                            ack_template.ack.timestamp = int(_time())
+
+                            # 직렬화한 bytes를 큐에 넣어 템플릿을 바로 다음 ACK에 재사용
+                            await response_queue.put(ack_template.SerializeToString())
                             print(f"[PYTHON CLIENT] Sent ACK for message {message_id}")
                 
                 # 서버 스트림이 종료되면 request_generator도 종료
@@ -75,12 +152,27 @@ class StreamingClient:
                 print(f"[PYTHON CLIENT] Unexpected error: {e}")
                 stream_finished.set()
 
+        finally:
+            await pool.close()
+
     def run(self):
         print("[PYTHON CLIENT] Starting Python gRPC client...")
         print(f"[PYTHON CLIENT] Connecting to server at {self.server_address}")
         print(f"[PYTHON CLIENT] Simulating message drops with {self.drop_probability * 100}% probability")
         
-        asyncio.run(self.bidirectional_stream())
+        # libuv 기반 이벤트 루프로 교체 (asyncio API 호환, I/O 오버헤드 감소)
+        uvloop.install()
+
+        def loop_factory():
+            loop = asyncio.new_event_loop()
+            # 즉시 완료 가능한 코루틴은 스케줄러를 거치지 않고 바로 실행
+            loop.set_task_factory(asyncio.eager_task_factory)
+            return loop
+
+        # Runner는 asyncio.run과 같은 종료 정리(잔여 태스크 취소,
+        # shutdown_asyncgens)를 수행한 뒤 루프를 닫아 줌
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(self.bidirectional_stream())
 
 
 if __name__ == "__main__":
@@ -1,13 +1,18 @@
+import asyncio
+import functools
+import sys
 from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+import numpy as np
 import ray
 from ray._private.internal_api import get_state_from_address, node_stats
 from ray.dashboard.utils import node_stats_to_dict
 
 ray_host = "0.0.0.0"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NodeMemoryStats:
     """Statistics for memory usage on a single node."""
     node_id: str
@@ -31,18 +36,33 @@ class NodeMemoryStats:
     restored_bytes: int
 
 
+@functools.lru_cache(maxsize=4)
+def _get_state(address: Optional[str]):
+    """Get a (cached) GlobalState handle for the given cluster address.
+
+    Connecting to the GCS involves a gRPC handshake, so reuse the handle
+    across polls instead of reconnecting on every call.
+    """
+    return get_state_from_address(address)
+
+
+def invalidate_state_cache() -> None:
+    """Drop cached GCS state handles (e.g. after a cluster restart)."""
+    _get_state.cache_clear()
+
+
 def get_cluster_nodes_info(address: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Get information about all nodes in the Ray cluster.
-    
+
     Args:
         address: Ray cluster address (optional, uses current cluster if None)
-        
+
     Returns:
         List of node information dictionaries
     """
     try:
-        state = get_state_from_address(address)
+        state = _get_state(address)
         nodes = state.node_table()
         return nodes
     except Exception as e:
@@ -172,41 +192,94 @@ def get_per_node_memory_usage(address: Optional[str] = None) -> List[NodeMemoryS
     if not nodes_info:
         print("No nodes found in the cluster")
         return []
-    
-    node_stats_list = []
-    
-    for node_info in nodes_info:
-        if not node_info.get("Alive", False):
-            # Include offline nodes with empty stats
-            stats = parse_node_stats(node_info, None)
-            node_stats_list.append(stats)
-            continue
-            
-        node_manager_address = node_info.get("NodeManagerAddress")
-        node_manager_port = node_info.get("NodeManagerPort")
-        
-        if not node_manager_address or not node_manager_port:
-            print(f"Skipping node {node_info.get('NodeID', 'unknown')}: missing address/port")
-            continue
-            
-        # Get detailed stats for this node
-        node_stats_dict = get_node_memory_usage(node_manager_address, node_manager_port)
-        stats = parse_node_stats(node_info, node_stats_dict)
-        node_stats_list.append(stats)
-    
+
+    # (node_info, future) pairs; dead nodes carry no future
+    pending = []
+
+    # node_stats is a blocking gRPC call per node, so dispatch them
+    # concurrently: wall-clock drops from sum-of-RTTs to max-of-RTTs
+    with ThreadPoolExecutor(max_workers=min(len(nodes_info), 16)) as executor:
+        for node_info in nodes_info:
+            if not node_info.get("Alive", False):
+                # Include offline nodes with empty stats
+                pending.append((node_info, None))
+                continue
+
+            node_manager_address = node_info.get("NodeManagerAddress")
+            node_manager_port = node_info.get("NodeManagerPort")
+
+            if not node_manager_address or not node_manager_port:
+                print(f"Skipping node {node_info.get('NodeID', 'unknown')}: missing address/port")
+                continue
+
+            # Get detailed stats for this node
+            future = executor.submit(
+                get_node_memory_usage, node_manager_address, node_manager_port)
+            pending.append((node_info, future))
+
+        # Collect in submission order so output stays stable
+        node_stats_list = [
+            parse_node_stats(node_info, future.result() if future else None)
+            for node_info, future in pending
+        ]
+
     return node_stats_list
 
 
+# Column layout for as_soa; mirrors the numeric fields of NodeMemoryStats
+_STATS_DTYPE = np.dtype([
+    ("alive", "?"),
+    ("total_memory", "i8"),
+    ("used_memory", "i8"),
+    ("available_memory", "i8"),
+    ("object_store_total", "i8"),
+    ("object_store_used", "i8"),
+    ("object_store_available", "i8"),
+    ("num_objects", "i8"),
+    ("object_store_fallback_used", "i8"),
+    ("spilled_bytes", "i8"),
+    ("restored_bytes", "i8"),
+])
+
+
+def as_soa(node_stats_list: List[NodeMemoryStats]) -> np.ndarray:
+    """
+    Convert a list of NodeMemoryStats (array-of-structs) into a NumPy
+    structured array (struct-of-arrays).
+
+    Cluster-wide totals then become single vectorized reductions
+    (e.g. arr['used_memory'].sum()) instead of Python accumulation loops.
+
+    Args:
+        node_stats_list: List of node statistics
+
+    Returns:
+        Structured array with one row per node
+    """
+    return np.array(
+        [
+            (stats.alive, stats.total_memory, stats.used_memory,
+             stats.available_memory, stats.object_store_total,
+             stats.object_store_used, stats.object_store_available,
+             stats.num_objects, stats.object_store_fallback_used,
+             stats.spilled_bytes, stats.restored_bytes)
+            for stats in node_stats_list
+        ],
+        dtype=_STATS_DTYPE,
+    )
+
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def format_bytes(bytes_value: int) -> str:
     """Format bytes into human readable string."""
-    if bytes_value == 0:
+    if bytes_value <= 0:
         return "0 B"
-    
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.1f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.1f} PB"
+
+    # Pick the unit from the bit length instead of dividing in a loop
+    unit_index = min((bytes_value.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (unit_index * 10)):.1f} {_BYTE_UNITS[unit_index]}"
 
 
 def format_percentage(used: int, total: int) -> str:
@@ -229,81 +302,85 @@ def display_cluster_memory_usage(node_stats_list: List[NodeMemoryStats],
     if not node_stats_list:
         print("No node statistics available")
         return
-    
-    print("=" * 100)
-    print("RAY CLUSTER MEMORY USAGE")
-    print("=" * 100)
-    
+
+    # Collect all output and emit it with one write at the end, instead
+    # of locking and flushing stdout once per print
+    lines = []
+
+    lines.append("=" * 100)
+    lines.append("RAY CLUSTER MEMORY USAGE")
+    lines.append("=" * 100)
+
     # System Memory Usage Table
-    print("\n📊 SYSTEM MEMORY USAGE PER NODE")
-    print("-" * 100)
-    print(f"{'Node Address':<20} {'Status':<8} {'Total Memory':<15} {'Used Memory':<15} {'Available':<15} {'Usage %':<10}")
-    print("-" * 100)
-    
-    total_system_memory = 0
-    total_used_memory = 0
-    alive_nodes = 0
-    
+    lines.append("\n📊 SYSTEM MEMORY USAGE PER NODE")
+    lines.append("-" * 100)
+    lines.append(f"{'Node Address':<20} {'Status':<8} {'Total Memory':<15} {'Used Memory':<15} {'Available':<15} {'Usage %':<10}")
+    lines.append("-" * 100)
+
+    # Cluster totals as vectorized column reductions over the SoA view
+    soa = as_soa(node_stats_list)
+    alive_soa = soa[soa["alive"]]
+    alive_nodes = len(alive_soa)
+    total_system_memory = int(alive_soa["total_memory"].sum())
+    total_used_memory = int(alive_soa["used_memory"].sum())
+
     for stats in node_stats_list:
         status = "ALIVE" if stats.alive else "DEAD"
-        if stats.alive:
-            alive_nodes += 1
-            total_system_memory += stats.total_memory
-            total_used_memory += stats.used_memory
-            
         usage_pct = format_percentage(stats.used_memory, stats.total_memory)
-        
-        print(f"{stats.node_address:<20} {status:<8} {format_bytes(stats.total_memory):<15} "
-              f"{format_bytes(stats.used_memory):<15} {format_bytes(stats.available_memory):<15} {usage_pct:<10}")
-    
-    print("-" * 100)
-    print(f"{'CLUSTER TOTAL':<20} {f'{alive_nodes} alive':<8} {format_bytes(total_system_memory):<15} "
-          f"{format_bytes(total_used_memory):<15} {format_bytes(total_system_memory - total_used_memory):<15} "
-          f"{format_percentage(total_used_memory, total_system_memory):<10}")
-    
+
+        lines.append(f"{stats.node_address:<20} {status:<8} {format_bytes(stats.total_memory):<15} "
+                     f"{format_bytes(stats.used_memory):<15} {format_bytes(stats.available_memory):<15} {usage_pct:<10}")
+
+    lines.append("-" * 100)
+    lines.append(f"{'CLUSTER TOTAL':<20} {f'{alive_nodes} alive':<8} {format_bytes(total_system_memory):<15} "
+                 f"{format_bytes(total_used_memory):<15} {format_bytes(total_system_memory - total_used_memory):<15} "
+                 f"{format_percentage(total_used_memory, total_system_memory):<10}")
+
     if include_object_store:
         # Object Store Usage Table
-        print(f"\n🗄️  OBJECT STORE USAGE PER NODE")
-        print("-" * 120)
-        print(f"{'Node Address':<20} {'Status':<8} {'Total Store':<12} {'Used Store':<12} {'Available':<12} "
-              f"{'Usage %':<10} {'Objects':<8} {'Fallback':<12} {'Spilled':<12}")
-        print("-" * 120)
-        
-        total_object_store = 0
-        total_object_store_used = 0
-        total_objects = 0
-        total_fallback = 0
-        total_spilled = 0
-        
+        lines.append(f"\n🗄️  OBJECT STORE USAGE PER NODE")
+        lines.append("-" * 120)
+        lines.append(f"{'Node Address':<20} {'Status':<8} {'Total Store':<12} {'Used Store':<12} {'Available':<12} "
+                     f"{'Usage %':<10} {'Objects':<8} {'Fallback':<12} {'Spilled':<12}")
+        lines.append("-" * 120)
+
+        total_object_store = int(alive_soa["object_store_total"].sum())
+        total_object_store_used = int(alive_soa["object_store_used"].sum())
+        total_objects = int(alive_soa["num_objects"].sum())
+        total_fallback = int(alive_soa["object_store_fallback_used"].sum())
+        total_spilled = int(alive_soa["spilled_bytes"].sum())
+
         for stats in node_stats_list:
             status = "ALIVE" if stats.alive else "DEAD"
-            if stats.alive:
-                total_object_store += stats.object_store_total
-                total_object_store_used += stats.object_store_used
-                total_objects += stats.num_objects
-                total_fallback += stats.object_store_fallback_used
-                total_spilled += stats.spilled_bytes
-                
             usage_pct = format_percentage(stats.object_store_used, stats.object_store_total)
-            
-            print(f"{stats.node_address:<20} {status:<8} {format_bytes(stats.object_store_total):<12} "
-                  f"{format_bytes(stats.object_store_used):<12} {format_bytes(stats.object_store_available):<12} "
-                  f"{usage_pct:<10} {stats.num_objects:<8} {format_bytes(stats.object_store_fallback_used):<12} "
-                  f"{format_bytes(stats.spilled_bytes):<12}")
-        
-        print("-" * 120)
-        print(f"{'CLUSTER TOTAL':<20} {f'{alive_nodes} alive':<8} {format_bytes(total_object_store):<12} "
-              f"{format_bytes(total_object_store_used):<12} {format_bytes(total_object_store - total_object_store_used):<12} "
-              f"{format_percentage(total_object_store_used, total_object_store):<10} {total_objects:<8} "
-              f"{format_bytes(total_fallback):<12} {format_bytes(total_spilled):<12}")
-    
-    print("\n" + "=" * 100)
+
+            lines.append(f"{stats.node_address:<20} {status:<8} {format_bytes(stats.object_store_total):<12} "
+                         f"{format_bytes(stats.object_store_used):<12} {format_bytes(stats.object_store_available):<12} "
+                         f"{usage_pct:<10} {stats.num_objects:<8} {format_bytes(stats.object_store_fallback_used):<12} "
+                         f"{format_bytes(stats.spilled_bytes):<12}")
+
+        lines.append("-" * 120)
+        lines.append(f"{'CLUSTER TOTAL':<20} {f'{alive_nodes} alive':<8} {format_bytes(total_object_store):<12} "
+                     f"{format_bytes(total_object_store_used):<12} {format_bytes(total_object_store - total_object_store_used):<12} "
+                     f"{format_percentage(total_object_store_used, total_object_store):<10} {total_objects:<8} "
+                     f"{format_bytes(total_fallback):<12} {format_bytes(total_spilled):<12}")
+
+    lines.append("\n" + "=" * 100)
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main function to demonstrate cluster memory monitoring."""
     print("Ray Cluster Memory Monitor")
     print("-" * 50)
-    
+
+    # Cap the asyncio default executor: the stdlib spawns up to
+    # min(32, cpu_count + 4) threads on demand, far more than this
+    # monitor's handful of concurrent RPCs needs
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=4))
+    asyncio.set_event_loop(loop)
+
     # Check if Ray is initialized
     if not ray.is_initialized():
         print("Ray is not initialized. Starting Ray...")
@@ -1,6 +1,7 @@
 import os
 import time
 
+import numpy as np
 import ray
 
 from plasma_copy.cluster_memory_monitor import get_per_node_memory_usage
@@ -17,9 +18,10 @@ class DataProducer:
         """지정된 크기의 랜덤 바이트 객체를 생성하여 반환합니다."""
         print(f"[Producer on node1] {OBJECT_SIZE_MB}MB 객체 생성 중...")
         # os.urandom을 사용해 압축되지 않는 랜덤 데이터 생성
-        start_time = time.time()
-        data = os.urandom(OBJECT_SIZE_BYTES)
-        print(f"[Producer on node1] 객체 생성 완료. 크기: {len(data)} bytes, 소요 시간: {time.time() - start_time:.2f} 초")
+        # ndarray로 감싸면 수신 측에서 plasma 버퍼를 zero-copy로 읽을 수 있음
+        start_time = time.monotonic()
+        data = np.frombuffer(os.urandom(OBJECT_SIZE_BYTES), dtype=np.uint8)
+        print(f"[Producer on node1] 객체 생성 완료. 크기: {data.nbytes} bytes, 소요 시간: {time.monotonic() - start_time:.2f} 초")
         return data
 
 
@@ -28,10 +30,11 @@ class DataProducer:
 class DataConsumer:
     def receive_object(self, data):
         """데이터를 받아서 처리합니다. receive_object.remote() 호출 시점에 이미 데이터 전송이 완료됨."""
-        print(f"[Consumer on node2] 데이터 크기: {len(data)} bytes")
-        
+        # ndarray는 plasma 버퍼를 그대로 매핑하므로 bytes 복사가 발생하지 않음
+        print(f"[Consumer on node2] 데이터 크기: {data.nbytes} bytes")
+
         # 수신된 데이터의 크기를 반환하여 작업 완료 확인
-        return len(data)
+        return data.nbytes
 
 ray_host = "0.0.0.0"
 
@@ -58,18 +61,22 @@ def main():
 
     # 시간 측정 시작 - consumer.receive_object.remote() 호출 시점부터 데이터 전송 시작
     print("[Main on node1] node1 -> node2 데이터 전송 시작...")
-    start_time = time.time()
+    # 경과 시간 측정이므로 NTP 보정에 영향받지 않는 monotonic 시계 사용
+    start_time = time.monotonic()
 
     # consumer에게 ObjectRef들을 전달하여 실제 데이터 전송 발생
     # receive_object.remote(obj_ref) 호출 시점에 ray.get(obj_ref)이 암시적으로 실행됨
     result_refs = [consumer.receive_object.remote(obj_ref) for obj_ref in object_refs]
-    results = ray.get(result_refs)  # consumer 작업 완료 대기
-    
+
+    # 전체가 끝날 때까지 한 번에 기다리지 않고, 완료되는 대로 결과를 소비 (파이프라이닝)
+    total_received_bytes = 0
+    pending = result_refs
+    while pending:
+        done, pending = ray.wait(pending, num_returns=1)
+        total_received_bytes += ray.get(done[0])
+
     # 시간 측정 종료
-    end_time = time.time()
-    
-    # 전송된 데이터 크기 확인
-    total_received_bytes = sum(results)  # consumer가 반환한 데이터 크기들의 합
+    end_time = time.monotonic()
     print(f"[Main on node1] 데이터 전송 완료! 총 수신: {total_received_bytes} bytes")
     
     # --- 결과 계산 및 출력 ---